@@ -76,7 +76,12 @@ group.add_argument(
 
 args = parser.parse_args()
 
-status = SlurmPipelineStatus(args.specification, fieldNames=args.fieldNames)
+# Printing lists of job ids only needs the state of each job, so in that case
+# just ask sacct for that.
+listing = args.printFinal or args.printFinished or args.printUnfinished
+fieldNames = "State" if listing else args.fieldNames
+
+status = SlurmPipelineStatus(args.specification, fieldNames=fieldNames)
 
 jobsFunc: Optional[Callable[[], set[int]]] = None
 
@@ -2,11 +2,19 @@ import json
 from json.decoder import JSONDecodeError
 import toml
 from collections import OrderedDict
+from itertools import chain
 from pathlib import Path
 from typing import Union
 
 from .error import SpecificationError
 
+try:
+    # orjson parses JSON much faster than the json module, which matters
+    # for large status files. Its JSONDecodeError is a subclass of json's.
+    from orjson import loads as fastJSONLoads
+except ImportError:
+    fastJSONLoads = json.loads  # type: ignore[assignment]
+
 
 class SlurmPipelineBase(object):
     """
@@ -136,27 +144,33 @@ class SlurmPipelineBase(object):
         @return: The parsed specification as a C{dict}.
         """
         with open(specificationFile) as fp:
+            data = fp.read()
+
+        try:
+            return fastJSONLoads(data)
+        except JSONDecodeError:
+            # orjson is stricter than json (e.g., it does not allow NaN), so
+            # also try json. If that fails too, its error message is used.
             try:
-                return json.load(fp)
+                return json.loads(data)
             except JSONDecodeError as e:
                 jsonError = e
 
-        with open(specificationFile) as fp:
-            try:
-                specification = toml.load(fp)
-            except toml.decoder.TomlDecodeError as tomlError:
-                raise ValueError(
-                    f"Specification file {specificationFile!r} could not be "
-                    f"parsed as JSON ({jsonError}) or TOML ({tomlError})."
-                )
-            else:
-                # Allow the TOML specification to optionally use 'step' for each step
-                # section, instead of 'steps'.
-                if "step" in specification and "steps" not in specification:
-                    specification["steps"] = specification["step"]
-                    del specification["step"]
+        try:
+            specification = toml.loads(data)
+        except toml.decoder.TomlDecodeError as tomlError:
+            raise ValueError(
+                f"Specification file {specificationFile!r} could not be "
+                f"parsed as JSON ({jsonError}) or TOML ({tomlError})."
+            )
+        else:
+            # Allow the TOML specification to optionally use 'step' for each step
+            # section, instead of 'steps'.
+            if "step" in specification and "steps" not in specification:
+                specification["steps"] = specification["step"]
+                del specification["step"]
 
-                return specification
+            return specification
 
     @staticmethod
     def specificationToJSON(specification: dict) -> str:
@@ -192,20 +206,10 @@ class SlurmPipelineBase(object):
 
         @return: A C{set} of C{str} step names.
         """
-        # This implementation is slightly inefficient, but is easy to
-        # understand. It would be faster to just gather all step names that
-        # appear in any step dependency and then return the set of all step
-        # names minus that set.
+        # Gather the names of all steps that appear in any step dependency.
+        # The final steps are all the others.
         steps = self.specification["steps"]
-        result = set()
-        for stepName in steps:
-            for step in steps.values():
-                try:
-                    if stepName in step["dependencies"]:
-                        break
-                except KeyError:
-                    pass
-            else:
-                result.add(stepName)
-
-        return result
+        dependedOn = set(
+            chain.from_iterable(step.get("dependencies", ()) for step in steps.values())
+        )
+        return set(steps) - dependedOn
@@ -1,11 +1,28 @@
 from os import environ
 import subprocess
 from collections import defaultdict
+from enum import IntEnum
 from typing import Optional
 
 from .error import SAcctError
 
 
+class JobState(IntEnum):
+    """
+    Integer codes for the sacct job states. Any state not listed here (e.g.,
+    "CANCELLED by 1234") is given the code C{OTHER}.
+    """
+
+    OTHER = 0
+    PENDING = 1
+    RUNNING = 2
+    COMPLETED = 3
+    FAILED = 4
+    CANCELLED = 5
+    TIMEOUT = 6
+    NODE_FAIL = 7
+
+
 class SAcct:
     """
     Fetch information about job id status from sacct.
@@ -18,12 +35,29 @@ class SAcct:
 
     DEFAULT_FIELD_NAMES = "JobName,State,Elapsed,Nodelist"
 
+    # Jobs in any other state (including states not in JobState) are finished.
+    UNFINISHED_STATES = frozenset((JobState.PENDING, JobState.RUNNING))
+
+    # The maximum number of job ids to pass to one sacct call. Linux limits a
+    # single command-line argument to 128KiB, so a comma-separated list of all
+    # the job ids of a large collection of pipelines could be too long.
+    MAX_JOB_IDS_PER_CALL = 5000
+
     def __init__(self, jobIds: set[int], fieldNames: Optional[str] = None) -> None:
         self.fieldNames = (
             fieldNames
             or environ.get("SP_STATUS_FIELD_NAMES")
             or self.DEFAULT_FIELD_NAMES
         )
+        # Job states are encoded as JobState ints so that checking them does
+        # not need string comparisons.
+        self._stateCodes: dict[int, JobState] = {}
+        # Job summaries are cached as they are made, as the same job can be
+        # summarized many times (e.g., by SlurmPipelineStatus.toStr).
+        self._summaries: dict[int, str] = {}
+        # The ids of jobs that are pending or running, so callers can find
+        # unfinished jobs with set operations.
+        self.unfinishedJobIds: frozenset[int] = frozenset()
         self.jobs = self._callSacct(jobIds) if jobIds else {}
 
     def _callSacct(self, jobIds: set[int]) -> defaultdict[int, dict[str, str]]:
@@ -36,47 +70,70 @@ class SAcct:
         # Copy of our argument because we will modify it.
         jobIds = set(jobIds)
         jobs: defaultdict[int, dict[str, str]] = defaultdict(dict)
-        args = [
-            "sacct",
-            "-P",
-            "--format",
-            "JobId," + self.fieldNames,
-            "--jobs",
-            ",".join(map(str, sorted(jobIds))),
-        ]
-        try:
-            out = subprocess.check_output(args, universal_newlines=True)
-        except OSError as e:
-            raise SAcctError(
-                "Encountered OSError (%s) when running '%s'" % (e, " ".join(args))
-            )
-
         fieldNamesLower = tuple(map(str.lower, self.fieldNames.split(",")))
+        # Always ask sacct for the job state, because it is needed to know
+        # which jobs have finished. If it was not in the field names we were
+        # given, ask for it straight after the job id (so our last field stays
+        # last) and leave it out of job summaries.
+        addState = "state" not in fieldNamesLower
+        formatFieldNames = ("State," if addState else "") + self.fieldNames
+        # Only split the text that follows a job id into as many fields as
+        # were asked for, so a final field value containing a '|' is kept whole.
+        maxsplit = len(fieldNamesLower) - 1
+        stateCodes = self._stateCodes
+        stateCode = JobState.__members__.get
+        other = JobState.OTHER
+        unfinished = self.UNFINISHED_STATES
+        unfinishedJobIds = set()
+        sortedJobIds = sorted(jobIds)
+        chunkSize = self.MAX_JOB_IDS_PER_CALL
+
+        for start in range(0, len(sortedJobIds), chunkSize):
+            args = [
+                "sacct",
+                "-P",
+                "--noheader",
+                "--format",
+                "JobId," + formatFieldNames,
+                "--jobs",
+                ",".join(map(str, sortedJobIds[start : start + chunkSize])),
+            ]
+            try:
+                out = subprocess.check_output(args, universal_newlines=True)
+            except OSError as e:
+                raise SAcctError(
+                    "Encountered OSError (%s) when running '%s'" % (e, " ".join(args))
+                )
 
-        for count, line in enumerate(out.split("\n")):
-            if count == 0 or (count == 1 and line and line[0] == "-"):
-                # First or second header line. When sacct is run with no
-                # arguments it for some reason prints a second header line
-                # that consists of hyphens and spaces. Check for that just
-                # in case it prints it under other circumstances.
-                continue
-            elif line:
-                fields = line.split("|")
-                if fields[0].find(".") > -1:
-                    # Ignore lines that have a job id like 1153494.extern
-                    continue
-                jobId = int(fields[0])
-                if jobId in jobs:
-                    raise SAcctError(
-                        "Job id %d found more than once in '%s' output"
-                        % (jobId, " ".join(args))
-                    )
-                if jobId in jobIds:
-                    jobIds.remove(jobId)
-                    fields.pop(0)
-                    jobInfo = jobs[jobId]
-                    for fieldName, value in zip(fieldNamesLower, fields):
-                        jobInfo[fieldName] = value
+            for line in out.splitlines():
+                if line:
+                    jobIdStr, _, rest = line.partition("|")
+                    if "." in jobIdStr:
+                        # Ignore lines that have a job id like 1153494.extern
+                        continue
+                    jobId = int(jobIdStr)
+                    if jobId in jobs:
+                        raise SAcctError(
+                            "Job id %d found more than once in '%s' output"
+                            % (jobId, " ".join(args))
+                        )
+                    if jobId in jobIds:
+                        jobIds.remove(jobId)
+                        jobInfo = jobs[jobId]
+                        if addState:
+                            jobInfo["state"], _, rest = rest.partition("|")
+                        jobInfo.update(zip(fieldNamesLower, rest.split("|", maxsplit)))
+                        state = jobInfo.get("state")
+                        if not state:
+                            raise SAcctError(
+                                "No job state found for job id %d in '%s' output"
+                                % (jobId, " ".join(args))
+                            )
+                        code = stateCodes[jobId] = stateCode(state, other)
+                        if code in unfinished:
+                            unfinishedJobIds.add(jobId)
+
+        self.unfinishedJobIds = frozenset(unfinishedJobIds)
 
         if jobIds:
             raise SAcctError(
@@ -98,7 +155,7 @@ class SAcct:
         @raise KeyError: If the job id cannot be found.
         @return: A C{bool} indicating whether the job has finished.
         """
-        return self.jobs[jobId]["state"] not in {"PENDING", "RUNNING"}
+        return self._stateCodes[jobId] not in self.UNFINISHED_STATES
 
     def failed(self, jobId: int) -> bool:
         """
@@ -108,7 +165,7 @@ class SAcct:
         @raise KeyError: If the job id cannot be found.
         @return: A C{bool} indicating whether the job failed.
         """
-        return self.jobs[jobId]["state"] == "FAILED"
+        return self._stateCodes[jobId] == JobState.FAILED
 
     def completed(self, jobId: int) -> bool:
         """
@@ -118,7 +175,7 @@ class SAcct:
         @raise KeyError: If the job id cannot be found.
         @return: A C{bool} indicating whether the job completed.
         """
-        return self.jobs[jobId]["state"] == "COMPLETED"
+        return self._stateCodes[jobId] == JobState.COMPLETED
 
     def state(self, jobId: int) -> str:
         """
@@ -138,8 +195,12 @@ class SAcct:
         @raise KeyError: If the job has not yet terminated.
         @return: a C{str} describing the job's state.
         """
-        jobInfo = self.jobs[jobId]
-        return ", ".join(
-            "%s=%s" % (fieldName, jobInfo[fieldName.lower()])
-            for fieldName in self.fieldNames.split(",")
-        )
+        try:
+            return self._summaries[jobId]
+        except KeyError:
+            jobInfo = self.jobs[jobId]
+            summary = self._summaries[jobId] = ", ".join(
+                "%s=%s" % (fieldName, jobInfo[fieldName.lower()])
+                for fieldName in self.fieldNames.split(",")
+            )
+            return summary
@@ -1,4 +1,5 @@
-import pandas as pd
+from functools import cached_property
+from itertools import chain
 from typing import Union, Optional, Iterable
 from pathlib import Path
 
@@ -21,12 +22,90 @@ class SlurmPipelineStatus(SlurmPipelineBase):
         See man sacct for the full list of possible field names.
     """
 
+    # The per-step line of the steps summary given by toStr.
+    STEP_SUMMARY_FORMAT = "    %s: %d job%s emitted, %d (%.2f%%) finished"
+
+    # The line for each job of a task (or task dependency) in toStr.
+    TASK_JOB_FORMAT = "        Job %d: %s"
+
+    # The line for each job the specification had to start after in toStr.
+    START_AFTER_JOB_FORMAT = "    Job %d: %s"
+
+    # The formats of the lines of each step's details in toStr that are
+    # always present.
+    STEP_DETAILS_FORMAT = (
+        "  Collect step: %(collect)s",
+        "  Error step: %(errorStep)s",
+        "  Working directory: %(cwd)s",
+        "  Scheduled at: %(scheduledAt)s",
+        "  Script: %(script)s",
+        "  Skip: %(skip)s",
+    )
+
     def __init__(
-        self, specification: Union[str, Path, dict], fieldNames: Optional[str] = None
+        self,
+        specification: Union[str, Path, dict],
+        fieldNames: Optional[str] = None,
     ) -> None:
         SlurmPipelineBase.__init__(self, specification)
-        jobIds = self.jobs() | set(self.specification["startAfter"] or ())
-        self.sacct = SAcct(jobIds, fieldNames=fieldNames)
+        steps = self.specification["steps"]
+        # Find the job ids emitted by (and depended on by) each step, and the
+        # job ids of the final steps and of all steps, once, for use in toStr.
+        self._stepJobIds = {
+            stepName: frozenset(chain.from_iterable(step["tasks"].values()))
+            for stepName, step in steps.items()
+        }
+        self._stepDependentJobIds = {
+            stepName: frozenset(
+                chain.from_iterable(step.get("taskDependencies", {}).values())
+            )
+            for stepName, step in steps.items()
+        }
+        self._finalJobs = frozenset(
+            chain.from_iterable(
+                self._stepJobIds[stepName] for stepName in self.finalSteps()
+            )
+        )
+        self._allJobIds = frozenset(chain.from_iterable(self._stepJobIds.values()))
+        # Lines describing the scheduling, made (once) by _schedulingSummary.
+        self._scheduling: Optional[list[str]] = None
+        # The ids of the jobs that sacct must be asked about: those emitted by
+        # the specification and those it was started after.
+        self.sacctJobIds = frozenset(
+            self._allJobIds.union(self.specification["startAfter"] or ())
+        )
+        self._fieldNames = fieldNames
+        # Job information from sacct is fetched (in one call) when it is first
+        # needed, unless it has been set. It is only fetched again if refresh
+        # is called.
+        self._sacct: Optional[SAcct] = None
+
+    @property
+    def sacct(self) -> SAcct:
+        """
+        Get information about the specification's jobs from sacct.
+
+        @return: An C{SAcct} instance.
+        """
+        if self._sacct is None:
+            self._sacct = SAcct(set(self.sacctJobIds), fieldNames=self._fieldNames)
+        return self._sacct
+
+    @sacct.setter
+    def sacct(self, sacct: SAcct) -> None:
+        """
+        Set the information about the specification's jobs.
+
+        @param sacct: An C{SAcct} instance with information about (at least)
+            all the jobs in C{self.sacctJobIds}.
+        """
+        self._sacct = sacct
+
+    def refresh(self) -> None:
+        """
+        Get up-to-date information about the specification's jobs from sacct.
+        """
+        self._sacct = SAcct(set(self.sacctJobIds), fieldNames=self._fieldNames)
 
     @staticmethod
     def checkSpecification(specification: dict) -> None:
@@ -50,12 +129,7 @@ class SlurmPipelineStatus(SlurmPipelineBase):
 
         @return: A C{set} of C{int} job ids.
         """
-        steps = self.specification["steps"]
-        result = set()
-        for stepName in self.finalSteps():
-            for jobIds in steps[stepName]["tasks"].values():
-                result.update(jobIds)
-        return result
+        return set(self._finalJobs)
 
     def finishedJobs(self) -> set[int]:
         """
@@ -63,13 +137,7 @@ class SlurmPipelineStatus(SlurmPipelineBase):
 
         @return: A C{set} of C{int} finished job ids.
         """
-        finished = self.sacct.finished
-        result = set()
-        for stepName in self.specification["steps"]:
-            result.update(
-                [jobid for jobid in self.stepJobIds(stepName) if finished(jobid)]
-            )
-        return result
+        return set(self._allJobIds - self.sacct.unfinishedJobIds)
 
     def unfinishedJobs(self) -> set[int]:
         """
@@ -77,13 +145,7 @@ class SlurmPipelineStatus(SlurmPipelineBase):
 
         @return: A C{set} of C{int} unfinished job ids.
         """
-        finished = self.sacct.finished
-        result = set()
-        for stepName in self.specification["steps"]:
-            result.update(
-                [jobid for jobid in self.stepJobIds(stepName) if not finished(jobid)]
-            )
-        return result
+        return set(self._allJobIds & self.sacct.unfinishedJobIds)
 
     def jobs(self) -> set[int]:
         """
@@ -91,11 +153,7 @@ class SlurmPipelineStatus(SlurmPipelineBase):
 
         @return: A C{set} of C{int} job ids.
         """
-        result = set()
-        for stepName in self.specification["steps"]:
-            jobIds = self.stepJobIds(stepName)
-            result.update(jobIds)
-        return result
+        return set(self._allJobIds)
 
     def stepDependentJobIds(self, stepName: str) -> set[int]:
         """
@@ -104,11 +162,7 @@ class SlurmPipelineStatus(SlurmPipelineBase):
         @param stepName: The C{str} name of a step.
         @return: A C{set} of C{int} job ids that a step is dependent on.
         """
-        step = self.specification["steps"][stepName]
-        jobIds = set()
-        for taskJobIds in step["taskDependencies"].values():
-            jobIds.update(taskJobIds)
-        return jobIds
+        return set(self._stepDependentJobIds[stepName])
 
     def stepJobIds(self, stepName: str) -> set[int]:
         """
@@ -117,11 +171,7 @@ class SlurmPipelineStatus(SlurmPipelineBase):
         @param stepName: The C{str} name of a step.
         @return: A C{set} of C{int} emitted job ids for the step.
         """
-        jobIds = set()
-        step = self.specification["steps"][stepName]
-        for taskJobIds in step["tasks"].values():
-            jobIds.update(taskJobIds)
-        return jobIds
+        return set(self._stepJobIds[stepName])
 
     def _stepSummary(self, stepName: str) -> list[str]:
         """
@@ -133,6 +183,11 @@ class SlurmPipelineStatus(SlurmPipelineBase):
         result: list[str] = []
         append = result.append
         step = self.specification["steps"][stepName]
+        summarize = self.sacct.summarize
+        taskJobFormat = self.TASK_JOB_FORMAT
+        # Finished jobs are counted with a set intersection (as in
+        # _stepsSummary) rather than by checking each job id.
+        unfinishedJobIds = self.sacct.unfinishedJobIds
 
         # Summarize step dependencies, if any.
         try:
@@ -152,10 +207,9 @@ class SlurmPipelineStatus(SlurmPipelineBase):
 
             taskDependencyCount = len(step["taskDependencies"])
 
-            jobIds = self.stepDependentJobIds(stepName)
+            jobIds = self._stepDependentJobIds[stepName]
             jobIdsCount = len(jobIds)
-            jobIdsFinished = [jobId for jobId in jobIds if self.sacct.finished(jobId)]
-            jobIdsFinishedCount = len(jobIdsFinished)
+            jobIdsFinishedCount = jobIdsCount - len(jobIds & unfinishedJobIds)
 
             append(
                 "    Dependent on %d task%s emitted by the dependent "
@@ -193,9 +247,7 @@ class SlurmPipelineStatus(SlurmPipelineBase):
                     jobIds = step["taskDependencies"][taskName]
                     append("      %s" % taskName)
                     for jobId in sorted(jobIds):
-                        append(
-                            "        Job %d: %s" % (jobId, self.sacct.summarize(jobId))
-                        )
+                        append(taskJobFormat % (jobId, summarize(jobId)))
         else:
             assert len(step["taskDependencies"]) == 0
             append("  No dependencies.")
@@ -209,11 +261,9 @@ class SlurmPipelineStatus(SlurmPipelineBase):
                 % (taskCount, "" if taskCount == 1 else "s")
             )
 
-            jobIds = self.stepJobIds(stepName)
+            jobIds = self._stepJobIds[stepName]
             jobIdsCount = len(jobIds)
-            jobIdsFinishedCount = len(
-                [jobId for jobId in jobIds if self.sacct.finished(jobId)]
-            )
+            jobIdsFinishedCount = jobIdsCount - len(jobIds & unfinishedJobIds)
 
             if jobIdsCount:
                 append(
@@ -241,23 +291,20 @@ class SlurmPipelineStatus(SlurmPipelineBase):
                     jobIds = step["tasks"][taskName]
                     append("      %s" % taskName)
                     for jobId in sorted(jobIds):
-                        append(
-                            "        Job %d: %s" % (jobId, self.sacct.summarize(jobId))
-                        )
+                        append(taskJobFormat % (jobId, summarize(jobId)))
         else:
             assert len(step["tasks"]) == 0
             append("  No tasks emitted by this step")
 
-        result.extend(
-            [
-                "  Collect step: %s" % step.get("collect", "False"),
-                "  Error step: %s" % step.get("error step", "False"),
-                "  Working directory: %s" % step.get("cwd", "."),
-                "  Scheduled at: %s" % secondsToTime(step["scheduledAt"]),
-                "  Script: %s" % step["script"],
-                "  Skip: %s" % step["skip"],
-            ]
-        )
+        details = {
+            "collect": step.get("collect", "False"),
+            "errorStep": step.get("error step", "False"),
+            "cwd": step.get("cwd", "."),
+            "scheduledAt": secondsToTime(step["scheduledAt"]),
+            "script": step["script"],
+            "skip": step["skip"],
+        }
+        result.extend(format_ % details for format_ in self.STEP_DETAILS_FORMAT)
 
         append("  Slurm pipeline environment variables:")
         for var in sorted(step["environ"]):
@@ -274,32 +321,27 @@ class SlurmPipelineStatus(SlurmPipelineBase):
         summary: list[str] = []
         append = summary.append
         steps = self.specification["steps"]
+        unfinishedJobIds = self.sacct.unfinishedJobIds
         totalJobIdsEmitted = totalJobIdsFinished = 0
 
         for stepName in steps:
-            jobIdsEmitted = self.stepJobIds(stepName)
+            jobIdsEmitted = self._stepJobIds[stepName]
             jobIdsEmittedCount = len(jobIdsEmitted)
-            jobIdsFinished = [
-                jobId for jobId in jobIdsEmitted if self.sacct.finished(jobId)
-            ]
-            jobIdsFinishedCount = len(jobIdsFinished)
+            jobIdsFinishedCount = jobIdsEmittedCount - len(
+                jobIdsEmitted & unfinishedJobIds
+            )
             totalJobIdsEmitted += jobIdsEmittedCount
             totalJobIdsFinished += jobIdsFinishedCount
 
             if jobIdsEmittedCount:
-                percent = (
-                    0.0
-                    if jobIdsEmittedCount == 0
-                    else jobIdsFinishedCount / jobIdsEmittedCount * 100.0
-                )
                 append(
-                    "    %s: %d job%s emitted, %d (%.2f%%) finished"
+                    self.STEP_SUMMARY_FORMAT
                     % (
                         stepName,
                         jobIdsEmittedCount,
                         "" if jobIdsEmittedCount == 1 else "s",
                         jobIdsFinishedCount,
-                        percent,
+                        jobIdsFinishedCount / jobIdsEmittedCount * 100.0,
                     )
                 )
             else:
@@ -318,69 +360,93 @@ class SlurmPipelineStatus(SlurmPipelineBase):
             "  Jobs finished: %d (%.2f%%)" % (totalJobIdsFinished, percent),
         ] + summary
 
-    def toStr(self) -> str:
+    def _schedulingSummary(self) -> list[str]:
         """
-        Get a printable summary of a status specification, including job
-        status.
+        Collect information about how the specification was scheduled. None of
+        this depends on job status, so the lines are only made once.
 
-        @return: A C{str} representation of the status specification.
+        @return: A new C{list} of C{str}s with the scheduling information.
         """
-        specification = self.specification
-        # Use specification.get to get the username so we don't break if
-        # we're run on a status file created before the username was being
-        # stored (added in 2.0.0).
-        result = [
-            "Scheduled by: %s" % specification.get("user", "UNKNOWN"),
-            "Scheduled at: %s" % secondsToTime(specification["scheduledAt"]),
-            "Scheduling arguments:",
-            "  First step: %s" % specification["firstStep"],
-            "  Force: %s" % specification["force"],
-            "  Last step: %s" % specification["lastStep"],
-        ]
-        append = result.append
+        if self._scheduling is None:
+            specification = self.specification
+            # Use specification.get to get the username so we don't break if
+            # we're run on a status file created before the username was being
+            # stored (added in 2.0.0).
+            self._scheduling = [
+                "Scheduled by: %s" % specification.get("user", "UNKNOWN"),
+                "Scheduled at: %s" % secondsToTime(specification["scheduledAt"]),
+                "Scheduling arguments:",
+                "  First step: %s" % specification["firstStep"],
+                "  Force: %s" % specification["force"],
+                "  Last step: %s" % specification["lastStep"],
+                "  Nice: %s" % specification.get("nice", "<None>"),
+                "  Sleep: %.2f" % specification.get("sleep", 0.0),
+                "  Script arguments: %s"
+                % (
+                    " ".join(specification["scriptArgs"])
+                    if specification["scriptArgs"]
+                    else "<None>"
+                ),
+                "  Skip: %s"
+                % (
+                    ", ".join(specification["skip"])
+                    if specification["skip"]
+                    else "<None>"
+                ),
+            ]
 
-        append("  Nice: %s" % specification.get("nice", "<None>"))
-        append("  Sleep: %.2f" % specification.get("sleep", 0.0))
+        return list(self._scheduling)
 
-        if specification["scriptArgs"]:
-            append("  Script arguments: %s" % " ".join(specification["scriptArgs"]))
-        else:
-            append("  Script arguments: <None>")
+    def _startAfterSummary(self) -> list[str]:
+        """
+        Collect information about the jobs the specification had to wait for.
 
-        if specification["skip"]:
-            append("  Skip: %s" % ", ".join(specification["skip"]))
-        else:
-            append("  Skip: <None>")
+        @return: A C{list} of C{str}s with information about the jobs.
+        """
+        startAfter = self.specification["startAfter"]
 
-        if specification["startAfter"]:
-            startAfter = specification["startAfter"]
-            nStartAfter = len(startAfter)
-            finishedCount = len(
-                [jobId for jobId in startAfter if self.sacct.finished(jobId)]
-            )
-            percent = finishedCount / nStartAfter * 100.0
+        if not startAfter:
+            return ["  Start after: <None>"]
 
-            append(
-                "  Start after the following %d job%s, of which %d (%.2f%%) "
-                "%s finished:"
-                % (
-                    nStartAfter,
-                    "" if nStartAfter == 1 else "s",
-                    finishedCount,
-                    percent,
-                    "is" if finishedCount == 1 else "are",
-                )
+        nStartAfter = len(startAfter)
+        unfinishedJobIds = self.sacct.unfinishedJobIds
+        finishedCount = sum(1 for jobId in startAfter if jobId not in unfinishedJobIds)
+
+        result = [
+            "  Start after the following %d job%s, of which %d (%.2f%%) "
+            "%s finished:"
+            % (
+                nStartAfter,
+                "" if nStartAfter == 1 else "s",
+                finishedCount,
+                finishedCount / nStartAfter * 100.0,
+                "is" if finishedCount == 1 else "are",
             )
-            for jobId in startAfter:
-                append("    Job %d: %s" % (jobId, self.sacct.summarize(jobId)))
-        else:
-            append("  Start after: <None>")
+        ]
+        summarize = self.sacct.summarize
+        startAfterJobFormat = self.START_AFTER_JOB_FORMAT
+        result.extend(
+            startAfterJobFormat % (jobId, summarize(jobId)) for jobId in startAfter
+        )
+
+        return result
+
+    def toStr(self) -> str:
+        """
+        Get a printable summary of a status specification, including job
+        status.
+
+        @return: A C{str} representation of the status specification.
+        """
+        result = self._schedulingSummary()
+        result.extend(self._startAfterSummary())
 
         # Summarize all steps, giving the number of jobs they started and
         # how many are finished.
         result.extend(self._stepsSummary())
 
         # Add information about each step in detail.
+        append = result.append
         for count, stepName in enumerate(self.specification["steps"], start=1):
             append("Step %d: %s" % (count, stepName))
             result.extend(self._stepSummary(stepName))
@@ -432,13 +498,16 @@ class SlurmPipelineStatusCollection:
                 f"{names!r}."
             )
 
+        allJobIds: set[int] = set()
+
         for count, (specification, name) in enumerate(
             zip(specifications, names), start=1
         ):
-            self.data[name] = SlurmPipelineStatus(specification)
+            status = self.data[name] = SlurmPipelineStatus(specification)
+            allJobIds.update(status.sacctJobIds)
 
             # Make sure the list of steps is the same for all specifications.
-            theseSteps = list(self.data[name].specification["steps"])
+            theseSteps = list(status.specification["steps"])
             if self.stepNames is None:
                 self.stepNames = theseSteps
             else:
@@ -451,6 +520,12 @@ class SlurmPipelineStatusCollection:
 
         assert self.stepNames is not None
 
+        # Get information about the jobs of all the specifications with a
+        # single call to sacct, instead of one call per specification.
+        collectionSAcct = SAcct(allJobIds)
+        for status in self.data.values():
+            status.sacct = collectionSAcct
+
         names = []
         steps = []
         tasks = []
@@ -476,19 +551,38 @@ class SlurmPipelineStatusCollection:
                         elapsed.append(elapsedStr)
                         seconds.append(elapsedToSeconds(elapsedStr))
 
+        # Test step membership against a set, not the (one per job) list of
+        # step names.
+        stepsWithJobs = set(steps)
         self.nonEmptyStepNames = [
-            stepName for stepName in self.stepNames if stepName in steps
+            stepName for stepName in self.stepNames if stepName in stepsWithJobs
         ]
 
-        self.df = pd.DataFrame(
-            {
-                "name": names,
-                "step": steps,
-                "task": tasks,
-                "jobId": jobIds,
-                "status": statuses,
-                "node": nodes,
-                "elapsed": elapsed,
-                "seconds": seconds,
-            }
-        )
+        # The columns of the DataFrame made (on first use) by df.
+        self._columns = {
+            "name": names,
+            "step": steps,
+            "task": tasks,
+            "jobId": jobIds,
+            "status": statuses,
+            "node": nodes,
+            "elapsed": elapsed,
+            "seconds": seconds,
+        }
+
+    @cached_property
+    def df(self):
+        """
+        Get a pandas DataFrame with one row for each job emitted by any of the
+        specifications.
+
+        @return: A C{pd.DataFrame} with columns giving the specification name,
+            step name, task name, job id, job status, node, elapsed time, and
+            elapsed seconds of each job.
+        """
+        # Import pandas here rather than at module level, so that importing
+        # slurm_pipeline (e.g., just to schedule a pipeline), or using a
+        # collection without its DataFrame, does not pay for it.
+        import pandas as pd
+
+        return pd.DataFrame(self._columns)
@@ -1,6 +1,8 @@
+from functools import lru_cache
 from time import gmtime, strftime
 
 
+@lru_cache(maxsize=1024)
 def secondsToTime(seconds: float, sacctCompatible: bool = False) -> str:
     """
     Convert a number of seconds to a time string.
@@ -22,6 +24,11 @@ def elapsedToSeconds(elapsed: str) -> int:
     @param elapsed: A C{str}, either as HH:MM:SS or DD-HH:MM:SS
     @return: An C{int} number of seconds.
     """
+    # Most elapsed times are HH:MM:SS, which can be converted without
+    # splitting.
+    if len(elapsed) == 8 and elapsed[2] == ":" and elapsed[5] == ":":
+        return int(elapsed[:2]) * 3600 + int(elapsed[3:5]) * 60 + int(elapsed[6:])
+
     fields = elapsed.split("-")
     if len(fields) == 1:
         daysSeconds = 0
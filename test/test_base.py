@@ -105,6 +105,25 @@ script = "scripts/summarize.sh"\n"""
             result = SlurmPipelineBase("file")
             self.assertEqual(3, len(result.specification["steps"]))
 
+    def testJSONWithNaN(self):
+        """
+        It must be possible to load a JSON specification that contains NaN,
+        which the json module accepts even though it is not strict JSON.
+        """
+        data = """\
+{
+    "sleep": NaN,
+    "steps": [
+        {
+            "name": "one-per-line",
+            "script": "scripts/one-word-per-line.sh"
+        }
+    ]
+}\n"""
+        with patch.object(builtins, "open", mock_open(read_data=data)):
+            result = SlurmPipelineBase("file")
+            self.assertEqual(1, len(result.specification["steps"]))
+
     def testJSONList(self):
         """
         If the specification file contains valid JSON but is a list instead
@@ -452,7 +471,7 @@ script = "scripts/summarize.sh"\n"""
             ],
         }
         spb = SlurmPipelineBase(specification)
-        self.assertEqual(set(("name1",)), spb.finalSteps())
+        self.assertEqual({"name1"}, spb.finalSteps())
 
     def testFinalStepsWithTwoSteps(self):
         """
@@ -472,7 +491,7 @@ script = "scripts/summarize.sh"\n"""
             ],
         }
         spb = SlurmPipelineBase(specification)
-        self.assertEqual(set(("name1", "name2")), spb.finalSteps())
+        self.assertEqual({"name1", "name2"}, spb.finalSteps())
 
     def testFinalStepsWithTwoStepsOneDependency(self):
         """
@@ -493,7 +512,7 @@ script = "scripts/summarize.sh"\n"""
             ],
         }
         spb = SlurmPipelineBase(specification)
-        self.assertEqual(set(("name2",)), spb.finalSteps())
+        self.assertEqual({"name2"}, spb.finalSteps())
 
     def testFinalStepsWithFiveSteps(self):
         """
@@ -527,7 +546,7 @@ script = "scripts/summarize.sh"\n"""
             ],
         }
         spb = SlurmPipelineBase(specification)
-        self.assertEqual(set(("name2", "name5")), spb.finalSteps())
+        self.assertEqual({"name2", "name5"}, spb.finalSteps())
 
     def testFinalStepsWithSixSteps(self):
         """
@@ -566,4 +585,4 @@ script = "scripts/summarize.sh"\n"""
             ],
         }
         spb = SlurmPipelineBase(specification)
-        self.assertEqual(set(("name6",)), spb.finalSteps())
+        self.assertEqual({"name6"}, spb.finalSteps())
@@ -1,5 +1,5 @@
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import call, patch
 
 from slurm_pipeline.error import SAcctError
 from slurm_pipeline.sacct import SAcct
@@ -10,35 +10,37 @@ class TestSAcct(TestCase):
     Tests for the slurm_pipeline.sacct.SAcct class.
     """
 
-    @patch("subprocess.check_output")
-    def testSacctNotFound(self, subprocessMock):
+    def setUp(self):
+        patcher = patch("subprocess.check_output")
+        self.subprocessMock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def testSacctNotFound(self):
         """
         When an attempt to run sacct fails due to an OSError of some kind, an
         SAcctError must be raised.
         """
-        subprocessMock.side_effect = OSError("No such file or directory")
+        self.subprocessMock.side_effect = OSError("No such file or directory")
         error = (
             r"^Encountered OSError \(No such file or directory\) when running "
-            "'sacct -P --format JobId,JobName,State,Elapsed,Nodelist "
+            "'sacct -P --noheader --format JobId,JobName,State,Elapsed,Nodelist "
             "--jobs 35,40'$"
         )
         self.assertRaisesRegex(SAcctError, error, SAcct, {35, 40})
 
-    @patch("subprocess.check_output")
-    def testSacctCalledAsExpectedWhenNoArgsPassed(self, subprocessMock):
+    def testSacctCalledAsExpectedWhenNoArgsPassed(self):
         """
         When no sacct field names are passed, it must be called as expected.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "1|name|COMPLETED|04:32:00|cpu-3\n"
-            "2|name|FAILED|05:11:37|cpu-4\n"
+        self.subprocessMock.return_value = (
+            "1|name|COMPLETED|04:32:00|cpu-3\n" "2|name|FAILED|05:11:37|cpu-4\n"
         )
         SAcct({1, 2})
-        subprocessMock.assert_called_once_with(
+        self.subprocessMock.assert_called_once_with(
             [
                 "sacct",
                 "-P",
+                "--noheader",
                 "--format",
                 "JobId,JobName,State,Elapsed,Nodelist",
                 "--jobs",
@@ -47,65 +49,130 @@ class TestSAcct(TestCase):
             universal_newlines=True,
         )
 
-    @patch("subprocess.check_output")
-    def testSacctFailsToReturnAllJobIds(self, subprocessMock):
+    def testSacctCalledInChunks(self):
+        """
+        If there are more job ids than can be passed to one sacct call, sacct
+        must be called on successive chunks of the (sorted) job ids, and the
+        information from all calls must be collected.
+        """
+        self.subprocessMock.side_effect = [
+            "1|name|COMPLETED|04:32:00|cpu-3\n" "2|name|FAILED|05:11:37|cpu-4\n",
+            "3|name|RUNNING|00:01:00|cpu-5\n",
+        ]
+        with patch.object(SAcct, "MAX_JOB_IDS_PER_CALL", 2):
+            sacct = SAcct({3, 1, 2})
+
+        args = [
+            "sacct",
+            "-P",
+            "--noheader",
+            "--format",
+            "JobId,JobName,State,Elapsed,Nodelist",
+            "--jobs",
+        ]
+        self.assertEqual(
+            [
+                call(args + ["1,2"], universal_newlines=True),
+                call(args + ["3"], universal_newlines=True),
+            ],
+            self.subprocessMock.call_args_list,
+        )
+        self.assertEqual({1, 2, 3}, set(sacct.jobs))
+        self.assertEqual({3}, sacct.unfinishedJobIds)
+
+    def testSacctFailsToReturnAllJobIds(self):
         """
         If sacct doesn't mention a needed job id, an SAcctError must be raised.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "1|name|COMPLETED|04:32:00|cpu-3\n"
-            "2|name|FAILED|05:11:37|cpu-4\n"
+        self.subprocessMock.return_value = (
+            "1|name|COMPLETED|04:32:00|cpu-3\n" "2|name|FAILED|05:11:37|cpu-4\n"
         )
 
         error = "^sacct did not return information about the following job " "id: 3$"
         self.assertRaisesRegex(SAcctError, error, SAcct, {1, 2, 3})
 
-    @patch("subprocess.check_output")
-    def testSacctCalledAsExpectedWhenFieldNamesPassed(self, subprocessMock):
+    def testSacctCalledAsExpectedWhenFieldNamesPassed(self):
         """
         When sacct field names are passed, sacct must be called as specified
-        and the correct fields and values must be added to the SAcct instance
-        'jobs' dict.
+        (with State added after JobId, since it was not given) and the correct fields and
+        values must be added to the SAcct instance 'jobs' dict.
         """
-        subprocessMock.return_value = (
-            "JobID|Color|Year\n" "1|red|1968\n" "2|green|2011\n"
+        self.subprocessMock.return_value = (
+            "1|COMPLETED|red|1968\n" "2|RUNNING|green|2011\n"
         )
         s = SAcct({1, 2}, fieldNames="Color,Year")
-        subprocessMock.assert_called_once_with(
-            ["sacct", "-P", "--format", "JobId,Color,Year", "--jobs", "1,2"],
+        self.subprocessMock.assert_called_once_with(
+            [
+                "sacct",
+                "-P",
+                "--noheader",
+                "--format",
+                "JobId,State,Color,Year",
+                "--jobs",
+                "1,2",
+            ],
             universal_newlines=True,
         )
-        self.assertEqual({"color": "red", "year": "1968"}, s.jobs[1])
-        self.assertEqual({"color": "green", "year": "2011"}, s.jobs[2])
+        self.assertEqual(
+            {"color": "red", "year": "1968", "state": "COMPLETED"}, s.jobs[1]
+        )
+        self.assertEqual(
+            {"color": "green", "year": "2011", "state": "RUNNING"}, s.jobs[2]
+        )
 
-    @patch("subprocess.check_output")
-    def testRepeatJobId(self, subprocessMock):
+    def testFieldNamesWithoutState(self):
+        """
+        When the field names passed do not include State, the job states must
+        still be fetched and used to find finished jobs, but must not appear
+        in job summaries.
+        """
+        self.subprocessMock.return_value = (
+            "1|COMPLETED|name1|04:32:00\n" "2|RUNNING|name2|01:02:03\n"
+        )
+        sa = SAcct({1, 2}, fieldNames="JobName,Elapsed")
+        self.assertEqual(
+            "JobId,State,JobName,Elapsed", self.subprocessMock.call_args.args[0][4]
+        )
+        self.assertTrue(sa.finished(1))
+        self.assertFalse(sa.finished(2))
+        self.assertEqual({2}, sa.unfinishedJobIds)
+        self.assertEqual("JobName=name1, Elapsed=04:32:00", sa.summarize(1))
+
+    def testMissingState(self):
+        """
+        If the sacct output for a job has no state, an SAcctError must be
+        raised.
+        """
+        self.subprocessMock.return_value = "1|name1\n"
+        error = (
+            "^No job state found for job id 1 in 'sacct -P --noheader --format "
+            "JobId,JobName,State --jobs 1' output$"
+        )
+        self.assertRaisesRegex(
+            SAcctError, error, SAcct, {1}, fieldNames="JobName,State"
+        )
+
+    def testRepeatJobId(self):
         """
         When the sacct output contains a repeated job id, an SAcctError must
         be raised.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "1|name|COMPLETED|04:32:00|(none)\n"
-            "1|name|FAILED|05:11:37|cpu-4\n"
+        self.subprocessMock.return_value = (
+            "1|name|COMPLETED|04:32:00|(none)\n" "1|name|FAILED|05:11:37|cpu-4\n"
         )
         error = (
-            "^Job id 1 found more than once in 'sacct -P --format "
+            "^Job id 1 found more than once in 'sacct -P --noheader --format "
             "JobId,JobName,State,Elapsed,Nodelist --jobs 1' output$"
         )
         self.assertRaisesRegex(SAcctError, error, SAcct, {1})
 
-    @patch("subprocess.check_output")
-    def testJobsDict(self, subprocessMock):
+    def testJobsDict(self):
         """
         The jobs dict on an SAcct instance must be set correctly if there
         is no error in the input.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "1|name1|COMPLETED|04:32:00|(none)\n"
-            "2|name2|FAILED|05:11:37|cpu-4\n"
+        self.subprocessMock.return_value = (
+            "1|name1|COMPLETED|04:32:00|(none)\n" "2|name2|FAILED|05:11:37|cpu-4\n"
         )
         sa = SAcct({1, 2})
         self.assertEqual(
@@ -126,47 +193,22 @@ class TestSAcct(TestCase):
             sa.jobs,
         )
 
-    @patch("subprocess.check_output")
-    def testJobsDictWithSecondHeaderLine(self, subprocessMock):
+    def testNoOutput(self):
         """
-        The jobs dict on an SAcct instance must be set correctly if the
-        input for some reason contains a second header line (as is printed,
-        for some reason, when you call sacct with no arguments).
+        If sacct produces no output at all, an SAcctError must be raised
+        listing all the job ids.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "----- ----- ----- ----- -----\n"
-            "1|name1|COMPLETED|04:32:00|(none)\n"
-            "2|name2|FAILED|05:11:37|cpu-4\n"
-        )
-        sa = SAcct({1, 2})
-        self.assertEqual(
-            {
-                1: {
-                    "elapsed": "04:32:00",
-                    "jobname": "name1",
-                    "state": "COMPLETED",
-                    "nodelist": "(none)",
-                },
-                2: {
-                    "elapsed": "05:11:37",
-                    "jobname": "name2",
-                    "state": "FAILED",
-                    "nodelist": "cpu-4",
-                },
-            },
-            sa.jobs,
-        )
+        self.subprocessMock.return_value = ""
+        error = "^sacct did not return information about the following job ids: 1, 2$"
+        self.assertRaisesRegex(SAcctError, error, SAcct, {1, 2})
 
-    @patch("subprocess.check_output")
-    def testJobsDictWithJobIdsContainingDots(self, subprocessMock):
+    def testJobsDictWithJobIdsContainingDots(self):
         """
         The jobs dict on an SAcct instance must be set correctly if the
         input contains job ids that have dots in them. Only the lines with
         job ids that do not have dots should be processed.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
+        self.subprocessMock.return_value = (
             "1|name1|COMPLETED|04:32:00|cpu-0\n"
             "1.batch|name1|COMPLETED|04:00:00|cpu-2\n"
             "1.extern|name1|COMPLETED|03:00:00|cpu-3\n"
@@ -192,13 +234,36 @@ class TestSAcct(TestCase):
             sa.jobs,
         )
 
-    @patch("subprocess.check_output")
-    def testSummarize(self, subprocessMock):
+    def testLastFieldContainingSeparator(self):
+        """
+        If the value of the final field contains a '|', the value must not be
+        split.
+        """
+        self.subprocessMock.return_value = "1|COMPLETED|a|b\n"
+        sa = SAcct({1}, fieldNames="State,Comment")
+        self.assertEqual({"state": "COMPLETED", "comment": "a|b"}, sa.jobs[1])
+
+    def testLastFieldContainingSeparatorWithoutState(self):
+        """
+        If State is not in the field names and the value of the final field
+        contains a '|', the value must not be split and the job state must
+        still be found.
+        """
+        self.subprocessMock.return_value = "1|RUNNING|a|b\n"
+        sa = SAcct({1}, fieldNames="Comment")
+        self.assertEqual(
+            "JobId,State,Comment", self.subprocessMock.call_args.args[0][4]
+        )
+        self.assertEqual({"state": "RUNNING", "comment": "a|b"}, sa.jobs[1])
+        self.assertFalse(sa.finished(1))
+        self.assertEqual({1}, sa.unfinishedJobIds)
+        self.assertEqual("Comment=a|b", sa.summarize(1))
+
+    def testSummarize(self):
         """
         It must be possible to get a summary of a job's status.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
+        self.subprocessMock.return_value = (
             "1|name|COMPLETED|04:32:00|cpu-3\n"
             "2|name|FAILED|05:11:37|cpu-4\n"
             "3|name|FINISHED|05:13:00|cpu-6\n"
@@ -217,72 +282,112 @@ class TestSAcct(TestCase):
             sa.summarize(3),
         )
 
-    @patch("subprocess.check_output")
-    def testSummarizePreservesFieldNameCase(self, subprocessMock):
+    def testSummarizeRepeated(self):
+        """
+        Summarizing a job more than once must give the same result and must
+        not call sacct again.
+        """
+        self.subprocessMock.return_value = "1|name|COMPLETED|04:32:00|cpu-3\n"
+        sa = SAcct({1})
+        expected = "JobName=name, State=COMPLETED, Elapsed=04:32:00, Nodelist=cpu-3"
+        self.assertEqual(expected, sa.summarize(1))
+        self.assertEqual(expected, sa.summarize(1))
+        self.subprocessMock.assert_called_once()
+
+    def testSummarizeUnknownJobId(self):
+        """
+        Summarizing an unknown job id must raise KeyError.
+        """
+        self.subprocessMock.return_value = "1|name|COMPLETED|04:32:00|cpu-3\n"
+        sa = SAcct({1})
+        self.assertRaises(KeyError, sa.summarize, 2)
+
+    def testSummarizePreservesFieldNameCase(self):
         """
         The summary of a job must preserve the case of the field names
         provided by the user.
         """
-        subprocessMock.return_value = (
-            "JobID|State|Elapsed|Nodelist\n" "1|COMPLETED|04:32:00|cpu-3\n"
-        )
+        self.subprocessMock.return_value = "1|COMPLETED|04:32:00|cpu-3\n"
         sa = SAcct({1}, fieldNames="STATE,eLAPSED,Nodelist")
         self.assertEqual(
             "STATE=COMPLETED, eLAPSED=04:32:00, Nodelist=cpu-3", sa.summarize(1)
         )
 
-    @patch("subprocess.check_output")
-    def testFinished(self, subprocessMock):
+    def testFinished(self):
         """
         The 'finished' method must function as expected.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "1|name|RUNNING|04:32:00|(none)\n"
-            "2|name|FAILED|05:11:37|cpu-4\n"
+        self.subprocessMock.return_value = (
+            "1|name|RUNNING|04:32:00|(none)\n" "2|name|FAILED|05:11:37|cpu-4\n"
         )
         sa = SAcct({1, 2})
         self.assertFalse(sa.finished(1))
         self.assertTrue(sa.finished(2))
 
-    @patch("subprocess.check_output")
-    def testFailed(self, subprocessMock):
+    def testUnfinishedJobIds(self):
         """
-        The 'failed' method must function as expected.
+        The unfinishedJobIds attribute must contain the ids of pending and
+        running jobs.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "1|name|COMPLETED|04:32:00|(none)\n"
+        self.subprocessMock.return_value = (
+            "1|name|RUNNING|04:32:00|(none)\n"
             "2|name|FAILED|05:11:37|cpu-4\n"
+            "3|name|PENDING|00:00:00|(none)\n"
+            "4|name|COMPLETED|05:11:37|cpu-4\n"
+        )
+        sa = SAcct({1, 2, 3, 4})
+        self.assertEqual({1, 3}, sa.unfinishedJobIds)
+
+    def testFailed(self):
+        """
+        The 'failed' method must function as expected.
+        """
+        self.subprocessMock.return_value = (
+            "1|name|COMPLETED|04:32:00|(none)\n" "2|name|FAILED|05:11:37|cpu-4\n"
         )
         sa = SAcct({1, 2})
         self.assertFalse(sa.failed(1))
         self.assertTrue(sa.failed(2))
 
-    @patch("subprocess.check_output")
-    def testCompleted(self, subprocessMock):
+    def testCompleted(self):
         """
         The 'completed' method must function as expected.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "1|name|RUNNING|04:32:00|(none)\n"
-            "2|name|COMPLETED|05:11:37|cpu-4\n"
+        self.subprocessMock.return_value = (
+            "1|name|RUNNING|04:32:00|(none)\n" "2|name|COMPLETED|05:11:37|cpu-4\n"
         )
         sa = SAcct({1, 2})
         self.assertFalse(sa.completed(1))
         self.assertTrue(sa.completed(2))
 
-    @patch("subprocess.check_output")
-    def testState(self, subprocessMock):
+    def testState(self):
         """
         The 'state' method must function as expected.
         """
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "1|name|RUNNING|04:32:00|(none)\n"
-            "2|name|COMPLETED|05:11:37|cpu-4\n"
+        self.subprocessMock.return_value = (
+            "1|name|RUNNING|04:32:00|(none)\n" "2|name|COMPLETED|05:11:37|cpu-4\n"
         )
         sa = SAcct({1, 2})
         self.assertEqual("RUNNING", sa.state(1))
         self.assertTrue("COMPLETED", sa.state(2))
+
+    def testUnknownStateIsFinished(self):
+        """
+        A job in a state that is not one of the known states must be
+        considered finished, but neither failed nor completed, and its
+        original state string must be available.
+        """
+        self.subprocessMock.return_value = "1|name|CANCELLED by 1234|04:32:00|(none)\n"
+        sa = SAcct({1})
+        self.assertTrue(sa.finished(1))
+        self.assertFalse(sa.failed(1))
+        self.assertFalse(sa.completed(1))
+        self.assertEqual("CANCELLED by 1234", sa.state(1))
+
+    def testFinishedUnknownJobId(self):
+        """
+        Asking whether an unknown job id has finished must raise KeyError.
+        """
+        self.subprocessMock.return_value = "1|name|RUNNING|04:32:00|(none)\n"
+        sa = SAcct({1})
+        self.assertRaises(KeyError, sa.finished, 2)
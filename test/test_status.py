@@ -1,15 +1,100 @@
+from types import MappingProxyType
 from unittest import TestCase
 from unittest.mock import patch
 
 from slurm_pipeline.error import SpecificationError
 from slurm_pipeline.status import SlurmPipelineStatus, SlurmPipelineStatusCollection
 
+# The read-only defaults for the status specifications (and their steps) made
+# by _status and _step. Nothing in SlurmPipelineStatus changes a specification,
+# so the (empty) lists and dicts in these can be shared between tests.
+BASE_STATUS = MappingProxyType(
+    {
+        "force": False,
+        "lastStep": None,
+        "scheduledAt": 1481379658.5455897,
+        "scriptArgs": [],
+        "skip": [],
+        "startAfter": None,
+    }
+)
+
+BASE_STEP = MappingProxyType(
+    {
+        "scheduledAt": 1481379659.1530972,
+        "stdout": "",
+        "taskDependencies": {},
+        "tasks": {},
+    }
+)
+
+
+# Mock sacct output that is used by more than one test.
+SACCT_NINE_RUNNING = "".join(
+    "%d|name|RUNNING|04:32:00|cpu-3\n" % jobId for jobId in range(9)
+)
+
+SACCT_TWO_RUNNING = (
+    "34|name|RUNNING|04:32:00|cpu-3\n" "35|name|RUNNING|04:32:00|cpu-4\n"
+)
+
+SACCT_ONE_RUNNING = "123|name|RUNNING|04:32:00|cpu-4\n"
+
+SACCT_ONE_COMPLETED = "123|name|COMPLETED|04:32:00|cpu-4\n"
+
+SACCT_FIVE_MIXED = (
+    "12|name|RUNNING|04:32:00|cpu-3\n"
+    "34|name|COMPLETED|04:32:00|cpu-3\n"
+    "56|name|RUNNING|04:32:00|cpu-4\n"
+    "78|name|COMPLETED|04:32:00|cpu-4\n"
+    "90|name|RUNNING|04:32:00|cpu-5\n"
+)
+
+
+def _step(name: str, **kwargs) -> dict:
+    """
+    Make a status specification step.
+
+    @param name: The C{str} name of the step.
+    @param kwargs: Step keys and values, which override those in C{BASE_STEP}.
+        If no 'script' is given, the script will be the step name followed by
+        '.sh'.
+    @return: A C{dict} status specification step.
+    """
+    return {**BASE_STEP, "name": name, "script": name + ".sh", **kwargs}
+
+
+def _status(steps: list[dict], **kwargs) -> dict:
+    """
+    Make a status specification.
+
+    @param steps: A C{list} of step C{dict}s (e.g., as made by C{_step}).
+    @param kwargs: Top-level specification keys and values, which override
+        those in C{BASE_STATUS}.
+    @return: A C{dict} status specification.
+    """
+    return {**BASE_STATUS, "steps": steps, **kwargs}
+
+
+# A two-step specification whose five jobs are those in SACCT_FIVE_MIXED.
+STATUS_FIVE_JOBS = _status(
+    [
+        _step("start", tasks={"xxx": [12, 34]}),
+        _step("end", tasks={"yyy": [56, 78, 90]}),
+    ]
+)
+
 
 class TestSlurmPipelineStatus(TestCase):
     """
     Tests for the slurm_pipeline.status.SlurmPipelineStatus class.
     """
 
+    def setUp(self):
+        patcher = patch("subprocess.check_output")
+        self.subprocessMock = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def testNotScheduled(self):
         """
         If a specification without a top-level 'scheduledAt' key is passed to
@@ -18,791 +103,395 @@ class TestSlurmPipelineStatus(TestCase):
         error = "^The specification status has no top-level 'scheduledAt' key$"
         self.assertRaisesRegex(SpecificationError, error, SlurmPipelineStatus, {})
 
-    @patch("subprocess.check_output")
-    def testFinalJobsWithNoJobs(self, subprocessMock):
+    def testFinalJobsWithNoJobs(self):
         """
         The finalJobs method should produce an empty set of job ids if the
         final step of a specification emits no jobs.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        # Two tasks were emitted, but without job ids.
-                        "task1": [],
-                        "task2": [],
-                    },
-                },
-                {
-                    "name": "end",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "end.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
-            ],
-        }
-
-        subprocessMock.return_value = "JobID|JobName|State|Elapsed|Nodelist\n"
+        # Two tasks were emitted, but without job ids.
+        status = _status(
+            [
+                _step("start", tasks={"task1": [], "task2": []}),
+                _step("end"),
+            ]
+        )
 
         sps = SlurmPipelineStatus(status)
         self.assertEqual(set(), sps.finalJobs())
+        self.subprocessMock.assert_not_called()
 
-    @patch("subprocess.check_output")
-    def testFinalJobsWithoutDependencies(self, subprocessMock):
+    def testFinalJobsWithoutDependencies(self):
         """
         The finalJobs method should produce the correct set of job ids emitted
         by the final steps of a specification.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "task1": [0, 1],
-                        "task2": [2],
-                    },
-                },
-                {
-                    "name": "end",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "end.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "task1": [3, 4, 5],
-                        "task2": [7, 8],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "0|name|RUNNING|04:32:00|cpu-3\n"
-            "1|name|RUNNING|04:32:00|cpu-3\n"
-            "2|name|RUNNING|04:32:00|cpu-3\n"
-            "3|name|RUNNING|04:32:00|cpu-3\n"
-            "4|name|RUNNING|04:32:00|cpu-3\n"
-            "5|name|RUNNING|04:32:00|cpu-3\n"
-            "6|name|RUNNING|04:32:00|cpu-3\n"
-            "7|name|RUNNING|04:32:00|cpu-3\n"
-            "8|name|RUNNING|04:32:00|cpu-3\n"
+        status = _status(
+            [
+                _step("start", tasks={"task1": [0, 1], "task2": [2]}),
+                _step("end", tasks={"task1": [3, 4, 5], "task2": [7, 8]}),
+            ]
         )
 
+        self.subprocessMock.return_value = SACCT_NINE_RUNNING
+
         sps = SlurmPipelineStatus(status)
         self.assertEqual({0, 1, 2, 3, 4, 5, 7, 8}, sps.finalJobs())
 
-    @patch("subprocess.check_output")
-    def testFinalJobsWithDependencies(self, subprocessMock):
+    def testFinalJobsRepeated(self):
         """
-        The finalJobs method should produce the correct set of job ids emitted
-        by the final step of a specification that contains a dependency.
+        Calling finalJobs more than once must give the same result each time,
+        and changing a returned set must not affect later results.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "task1": [0, 1],
-                        "task2": [2],
-                    },
-                },
-                {
-                    "dependencies": ["start"],
-                    "name": "end",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "end.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "task1": [3, 4, 5],
-                        "task2": [7, 8],
-                    },
-                },
-            ],
-        }
+        status = _status(
+            [
+                _step("start", tasks={"task1": [0, 1]}),
+                _step("end", dependencies=["start"], tasks={"task1": [2]}),
+            ]
+        )
 
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
+        self.subprocessMock.return_value = (
             "0|name|RUNNING|04:32:00|cpu-3\n"
             "1|name|RUNNING|04:32:00|cpu-3\n"
             "2|name|RUNNING|04:32:00|cpu-3\n"
-            "3|name|RUNNING|04:32:00|cpu-3\n"
-            "4|name|RUNNING|04:32:00|cpu-3\n"
-            "5|name|RUNNING|04:32:00|cpu-3\n"
-            "6|name|RUNNING|04:32:00|cpu-3\n"
-            "7|name|RUNNING|04:32:00|cpu-3\n"
-            "8|name|RUNNING|04:32:00|cpu-3\n"
         )
 
         sps = SlurmPipelineStatus(status)
-        self.assertEqual({3, 4, 5, 7, 8}, sps.finalJobs())
+        sps.finalJobs().add(3)
+        self.assertEqual({2}, sps.finalJobs())
 
-    @patch("subprocess.check_output")
-    def testStepJobIdSummaryNoJobs(self, subprocessMock):
+    def testFinalJobsWithDependencies(self):
         """
-        The stepJobIds method should return an empty set if a step emitted no
-        jobs.
+        The finalJobs method should produce the correct set of job ids emitted
+        by the final step of a specification that contains a dependency.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
-            ],
-        }
+        status = _status(
+            [
+                _step("start", tasks={"task1": [0, 1], "task2": [2]}),
+                _step(
+                    "end",
+                    dependencies=["start"],
+                    tasks={"task1": [3, 4, 5], "task2": [7, 8]},
+                ),
+            ]
+        )
 
-        subprocessMock.return_value = "JobID|JobName|State|Elapsed|Nodelist\n"
+        self.subprocessMock.return_value = SACCT_NINE_RUNNING
 
         sps = SlurmPipelineStatus(status)
-        self.assertEqual(set(), sps.stepJobIds("start"))
+        self.assertEqual({3, 4, 5, 7, 8}, sps.finalJobs())
 
-    @patch("subprocess.check_output")
-    def testStepJobIdSummaryTwoJobsNeitherFinished(self, subprocessMock):
+    def testFinalSteps(self):
         """
-        The stepJobIds method should return the expected set if a step emitted
-        two jobs, neither of which is finished.
+        The finalSteps method should return the names of the steps that no
+        other step depends on.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "fun": [34, 35],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "34|name|RUNNING|04:32:00|cpu-3\n"
-            "35|name|RUNNING|04:32:00|cpu-4\n"
+        status = _status(
+            [
+                _step("start"),
+                _step("middle", dependencies=["start"]),
+                _step("end", dependencies=["start"]),
+            ]
         )
 
         sps = SlurmPipelineStatus(status)
-        self.assertEqual({34, 35}, sps.stepJobIds("start"))
+        self.assertEqual({"middle", "end"}, sps.finalSteps())
+        self.subprocessMock.assert_not_called()
 
-    @patch("subprocess.check_output")
-    def testStepJobIdSummaryTwoJobsOneFinished(self, subprocessMock):
+    def testNoJobs(self):
         """
-        The stepJobIds method should return the expected set if a step emitted
-        two jobs, one of which is finished.
+        The stepJobIds, unfinishedJobs, finishedJobs, and jobs methods should
+        all return an empty set if a specification emitted no jobs, and sacct
+        should not be called.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "fun": [34, 35],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "34|name|RUNNING|04:32:00|cpu-3\n"
-            "35|name|COMPLETED|04:32:00|cpu-4\n"
+        status = _status(
+            [
+                _step("start"),
+                _step("end"),
+            ]
         )
 
         sps = SlurmPipelineStatus(status)
-        self.assertEqual({34, 35}, sps.stepJobIds("start"))
+        self.assertEqual(set(), sps.stepJobIds("start"))
+        self.assertEqual(set(), sps.stepJobIds("end"))
+        self.assertEqual(set(), sps.unfinishedJobs())
+        self.assertEqual(set(), sps.finishedJobs())
+        self.assertEqual(set(), sps.jobs())
+        self.subprocessMock.assert_not_called()
 
-    @patch("subprocess.check_output")
-    def testStepJobIdSummaryTwoJobsBothFinished(self, subprocessMock):
+    def testStepJobIdSummaryTwoJobs(self):
         """
-        The stepJobIds method should return the expected set if a step
-        emitted two jobs, both of which are finished.
+        The stepJobIds, unfinishedJobs, and finishedJobs methods should return
+        the expected sets if a step emitted two jobs, none, one, or both of
+        which are finished.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "fun": [34, 35],
-                    },
-                },
-            ],
-        }
+        status = _status(
+            [
+                _step("start", tasks={"fun": [34, 35]}),
+            ]
+        )
 
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "34|name|COMPLETED|04:32:00|cpu-3\n"
-            "35|name|COMPLETED|04:32:00|cpu-4\n"
+        for state34, state35, unfinished, finished in (
+            ("RUNNING", "RUNNING", {34, 35}, set()),
+            ("RUNNING", "COMPLETED", {34}, {35}),
+            ("COMPLETED", "COMPLETED", set(), {34, 35}),
+        ):
+            with self.subTest(state34=state34, state35=state35):
+                self.subprocessMock.return_value = (
+                    "34|name|%s|04:32:00|cpu-3\n"
+                    "35|name|%s|04:32:00|cpu-4\n" % (state34, state35)
+                )
+
+                sps = SlurmPipelineStatus(status)
+                self.assertEqual({34, 35}, sps.stepJobIds("start"))
+                self.assertEqual(unfinished, sps.unfinishedJobs())
+                self.assertEqual(finished, sps.finishedJobs())
+
+    def testStepJobIdsReturnsNewSet(self):
+        """
+        Changing the set returned by stepJobIds must not affect the result of
+        a later call.
+        """
+        status = _status(
+            [
+                _step("start", tasks={"fun": [34], "more": [35]}),
+            ]
         )
 
+        self.subprocessMock.return_value = SACCT_TWO_RUNNING
+
         sps = SlurmPipelineStatus(status)
+        sps.stepJobIds("start").add(36)
         self.assertEqual({34, 35}, sps.stepJobIds("start"))
 
-    @patch("subprocess.check_output")
-    def testUnfinishedJobsNoJobs(self, subprocessMock):
+    def testStepDependentJobIds(self):
         """
-        The unfinishedJobs method should return an empty set if a
-        specification emitted no jobs.
+        The stepDependentJobIds method should return the ids of the jobs in all
+        the tasks the step depends on.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
-            ],
-        }
+        status = _status(
+            [
+                _step("start", tasks={"fun": [34], "more": [35]}),
+                _step(
+                    "end",
+                    dependencies=["start"],
+                    taskDependencies={"fun": [34], "more": [35]},
+                ),
+            ]
+        )
 
-        subprocessMock.return_value = "JobID|JobName|State|Elapsed|Nodelist\n"
+        self.subprocessMock.return_value = SACCT_TWO_RUNNING
 
         sps = SlurmPipelineStatus(status)
-        self.assertEqual(set(), sps.unfinishedJobs())
+        self.assertEqual(set(), sps.stepDependentJobIds("start"))
+        self.assertEqual({34, 35}, sps.stepDependentJobIds("end"))
 
-    @patch("subprocess.check_output")
-    def testUnfinishedJobsOneUnfinishedJob(self, subprocessMock):
+    def testUnfinishedJobsOneUnfinishedJob(self):
         """
         The unfinishedJobs method should return a set with the expected job id
         if the specification emitted one job that is not finished.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "xxx": [123],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n" "123|name|RUNNING|04:32:00|cpu-4\n"
+        status = _status(
+            [
+                _step("start", tasks={"xxx": [123]}),
+            ]
         )
 
+        self.subprocessMock.return_value = SACCT_ONE_RUNNING
+
         sps = SlurmPipelineStatus(status)
         self.assertEqual({123}, sps.unfinishedJobs())
 
-    @patch("subprocess.check_output")
-    def testUnfinishedJobsOneFinishedJob(self, subprocessMock):
+    def testUnfinishedJobsOneFinishedJob(self):
         """
         The unfinishedJobs method should return an empty set if the
         specification emitted one job that is finished.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "xxx": [123],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "123|name|COMPLETED|04:32:00|cpu-4\n"
+        status = _status(
+            [
+                _step("start", tasks={"xxx": [123]}),
+            ]
         )
 
+        self.subprocessMock.return_value = SACCT_ONE_COMPLETED
+
         sps = SlurmPipelineStatus(status)
         self.assertEqual(set(), sps.unfinishedJobs())
 
-    @patch("subprocess.check_output")
-    def testUnfinishedJobsMultipleSteps(self, subprocessMock):
+    def testUnfinishedJobsMultipleSteps(self):
         """
         The unfinishedJobs method should return the expected job ids if the
         specification has multiple steps.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "xxx": [12, 34],
-                    },
-                },
-                {
-                    "name": "end",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "end.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "yyy": [56, 78, 90],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "12|name|RUNNING|04:32:00|cpu-3\n"
-            "34|name|COMPLETED|04:32:00|cpu-3\n"
-            "56|name|RUNNING|04:32:00|cpu-4\n"
-            "78|name|COMPLETED|04:32:00|cpu-4\n"
-            "90|name|RUNNING|04:32:00|cpu-5\n"
-        )
+        self.subprocessMock.return_value = SACCT_FIVE_MIXED
 
-        sps = SlurmPipelineStatus(status)
+        sps = SlurmPipelineStatus(STATUS_FIVE_JOBS)
         self.assertEqual({12, 56, 90}, sps.unfinishedJobs())
 
-    @patch("subprocess.check_output")
-    def testFinishedJobsNoJobs(self, subprocessMock):
-        """
-        The finishedJobs method should return an empty set if a
-        specification emitted no jobs.
-        """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
-            ],
-        }
-
-        subprocessMock.return_value = "JobID|JobName|State|Elapsed|Nodelist\n"
-
-        sps = SlurmPipelineStatus(status)
-        self.assertEqual(set(), sps.finishedJobs())
-
-    @patch("subprocess.check_output")
-    def testFinishedJobsOneFinishedJob(self, subprocessMock):
+    def testFinishedJobsOneFinishedJob(self):
         """
         The finishedJobs method should return a set with the expected job id
         if the specification emitted one job that is finished.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "xxx": [123],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "123|name|COMPLETED|04:32:00|cpu-4\n"
+        status = _status(
+            [
+                _step("start", tasks={"xxx": [123]}),
+            ]
         )
 
+        self.subprocessMock.return_value = SACCT_ONE_COMPLETED
+
         sps = SlurmPipelineStatus(status)
         self.assertEqual({123}, sps.finishedJobs())
 
-    @patch("subprocess.check_output")
-    def testFinishedJobsOneUnfinishedJob(self, subprocessMock):
+    def testFinishedJobsOneUnfinishedJob(self):
         """
         The finishedJobs method should return an empty set if the
         specification emitted one job that is not finished.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "xxx": [123],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n" "123|name|RUNNING|04:32:00|cpu-4\n"
+        status = _status(
+            [
+                _step("start", tasks={"xxx": [123]}),
+            ]
         )
 
+        self.subprocessMock.return_value = SACCT_ONE_RUNNING
+
         sps = SlurmPipelineStatus(status)
         self.assertEqual(set(), sps.finishedJobs())
 
-    @patch("subprocess.check_output")
-    def testFinishedJobsMultipleSteps(self, subprocessMock):
+    def testFinishedJobsMultipleSteps(self):
         """
         The finishedJobs method should return the expected job ids if the
         specification has multiple steps.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "xxx": [12, 34],
-                    },
-                },
-                {
-                    "name": "end",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "end.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "yyy": [56, 78, 90],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "12|name|RUNNING|04:32:00|cpu-3\n"
-            "34|name|COMPLETED|04:32:00|cpu-3\n"
-            "56|name|RUNNING|04:32:00|cpu-4\n"
-            "78|name|COMPLETED|04:32:00|cpu-4\n"
-            "90|name|RUNNING|04:32:00|cpu-5\n"
-        )
+        self.subprocessMock.return_value = SACCT_FIVE_MIXED
 
-        sps = SlurmPipelineStatus(status)
+        sps = SlurmPipelineStatus(STATUS_FIVE_JOBS)
         self.assertEqual({34, 78}, sps.finishedJobs())
 
-    @patch("subprocess.check_output")
-    def testJobIdsNoJobs(self, subprocessMock):
+    def testFinishedAndUnfinishedJobsWithoutStateFieldName(self):
         """
-        The jobs method should return an empty set when no jobs were started.
+        The finishedJobs and unfinishedJobs methods, and the finished counts
+        in toStr, must use the job states even when the sacct field names
+        given do not include State.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
-                {
-                    "name": "end",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "end.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
+        status = _status(
+            [
+                _step(
+                    "start",
+                    environ={},
+                    skip=False,
+                    tasks={"xxx": [12, 34]},
+                ),
             ],
-        }
+            firstStep=None,
+        )
 
-        subprocessMock.return_value = "JobID|JobName|State|Elapsed|Nodelist\n"
+        self.subprocessMock.return_value = (
+            "12|RUNNING|name1|04:32:00\n" "34|COMPLETED|name2|01:02:03\n"
+        )
 
-        sps = SlurmPipelineStatus(status)
-        self.assertEqual(set(), sps.jobs())
+        sps = SlurmPipelineStatus(status, fieldNames="JobName,Elapsed")
+        self.assertEqual({12}, sps.unfinishedJobs())
+        self.assertEqual({34}, sps.finishedJobs())
+
+        result = sps.toStr()
+        self.assertIn("  Jobs finished: 1 (50.00%)", result)
+        self.assertIn(
+            "    Summary: 2 jobs started by this task, of which 1 (50.00%) are "
+            "finished",
+            result,
+        )
+        self.assertIn("        Job 12: JobName=name1, Elapsed=04:32:00", result)
 
-    @patch("subprocess.check_output")
-    def testJobIds(self, subprocessMock):
+    def testJobIds(self):
         """
         The jobs method should return all emitted job ids.
         """
-        status = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "xxx": [12, 34],
-                    },
-                },
-                {
-                    "name": "end",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "end.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "yyy": [56, 78, 90],
-                    },
-                },
-            ],
-        }
-
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "12|name|RUNNING|04:32:00|cpu-3\n"
-            "34|name|COMPLETED|04:32:00|cpu-3\n"
-            "56|name|RUNNING|04:32:00|cpu-4\n"
-            "78|name|COMPLETED|04:32:00|cpu-4\n"
-            "90|name|RUNNING|04:32:00|cpu-5\n"
-        )
+        self.subprocessMock.return_value = SACCT_FIVE_MIXED
 
-        sps = SlurmPipelineStatus(status)
+        sps = SlurmPipelineStatus(STATUS_FIVE_JOBS)
         self.assertEqual({12, 34, 56, 78, 90}, sps.jobs())
 
-    @patch("subprocess.check_output")
-    def testToStr(self, subprocessMock):
+    def testToStr(self):
         """
         The toStr method must return a complete summary of the status
         specification.
         """
-        status = {
-            "firstStep": "panel",
-            "force": False,
-            "lastStep": None,
-            "nice": 3,
-            "user": "sw463",
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "cwd": "00-start",
-                    "environ": {
-                        "SP_FORCE": "1",
-                        "SP_SKIP": "0",
-                    },
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "00-start/start.sh",
-                    "skip": False,
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
-                {
-                    "cwd": "01-split",
-                    "dependencies": ["start"],
-                    "environ": {
-                        "SP_FORCE": "1",
-                        "SP_SKIP": "0",
-                    },
-                    "name": "split",
-                    "scheduledAt": 1481379664.184737,
-                    "script": "01-split/sbatch.sh",
-                    "skip": False,
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "chunk-aaaaa": [],
-                        "chunk-aaaab": [],
-                        "chunk-aaaac": [],
-                    },
-                },
-                {
-                    "cwd": "02-blastn",
-                    "dependencies": ["split"],
-                    "environ": {
-                        "SP_FORCE": "1",
-                        "SP_SKIP": "0",
-                    },
-                    "name": "blastn",
-                    "scheduledAt": 1481379722.3996398,
-                    "script": "02-blastn/sbatch.sh",
-                    "skip": False,
-                    "stdout": "",
-                    "taskDependencies": {
+        status = _status(
+            [
+                _step(
+                    "start",
+                    script="00-start/start.sh",
+                    cwd="00-start",
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    skip=False,
+                ),
+                _step(
+                    "split",
+                    script="01-split/sbatch.sh",
+                    cwd="01-split",
+                    dependencies=["start"],
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    scheduledAt=1481379664.184737,
+                    skip=False,
+                    tasks={"chunk-aaaaa": [], "chunk-aaaab": [], "chunk-aaaac": []},
+                ),
+                _step(
+                    "blastn",
+                    script="02-blastn/sbatch.sh",
+                    cwd="02-blastn",
+                    dependencies=["split"],
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    scheduledAt=1481379722.3996398,
+                    skip=False,
+                    taskDependencies={
                         "chunk-aaaaa": [],
                         "chunk-aaaab": [],
                         "chunk-aaaac": [],
                     },
-                    "tasks": {
+                    tasks={
                         "chunk-aaaaa": [4416231],
                         "chunk-aaaab": [4416232],
                         "chunk-aaaac": [4416233],
                     },
-                },
-                {
-                    "collect": True,
-                    "cwd": "03-panel",
-                    "dependencies": ["blastn"],
-                    "environ": {
-                        "SP_FORCE": "1",
-                        "SP_SKIP": "0",
-                    },
-                    "name": "panel",
-                    "scheduledAt": 1481379722.5036008,
-                    "script": "03-panel/sbatch.sh",
-                    "skip": False,
-                    "stdout": "TASK: panel 4417615\n",
-                    "taskDependencies": {
+                ),
+                _step(
+                    "panel",
+                    script="03-panel/sbatch.sh",
+                    collect=True,
+                    cwd="03-panel",
+                    dependencies=["blastn"],
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    scheduledAt=1481379722.5036008,
+                    skip=False,
+                    stdout="TASK: panel 4417615\n",
+                    taskDependencies={
                         "chunk-aaaaa": [4416231],
                         "chunk-aaaab": [4416232],
                         "chunk-aaaac": [4416233],
                     },
-                    "tasks": {"panel": [4417615]},
-                },
-                {
-                    "cwd": "04-stop",
-                    "dependencies": ["panel"],
-                    "environ": {
-                        "SP_FORCE": "1",
-                        "SP_SKIP": "0",
-                    },
-                    "name": "stop",
-                    "scheduledAt": 1481379722.5428307,
-                    "script": "04-stop/sbatch.sh",
-                    "skip": False,
-                    "stdout": "TASK: stop 4417616\n",
-                    "taskDependencies": {"panel": [4417615]},
-                    "tasks": {"stop": [4417616]},
-                },
+                    tasks={"panel": [4417615]},
+                ),
+                _step(
+                    "stop",
+                    script="04-stop/sbatch.sh",
+                    cwd="04-stop",
+                    dependencies=["panel"],
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    scheduledAt=1481379722.5428307,
+                    skip=False,
+                    stdout="TASK: stop 4417616\n",
+                    taskDependencies={"panel": [4417615]},
+                    tasks={"stop": [4417616]},
+                ),
             ],
-        }
+            firstStep="panel",
+            nice=3,
+            user="sw463",
+        )
 
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
+        self.subprocessMock.return_value = (
             "4416231|name1|COMPLETED|04:32:00|cpu-3\n"
             "4416232|name2|COMPLETED|04:02:00|cpu-6\n"
             "4416233|name3|COMPLETED|04:12:00|cpu-7\n"
@@ -949,45 +638,40 @@ Nodelist=cpu-3
             sps.toStr(),
         )
 
-    @patch("subprocess.check_output")
-    def testToStrWithScriptArgsSkipAndStartAfter(self, subprocessMock):
+        # The job id methods must agree with the summary, using the same
+        # sacct information.
+        self.assertEqual({4416231, 4416232, 4416233, 4417615, 4417616}, sps.jobs())
+        self.assertEqual({4416231, 4416232, 4416233, 4417615}, sps.finishedJobs())
+        self.assertEqual({4417616}, sps.unfinishedJobs())
+        self.assertEqual({4417616}, sps.finalJobs())
+        self.subprocessMock.assert_called_once()
+
+    def testToStrWithScriptArgsSkipAndStartAfter(self):
         """
         The toStr method must return a complete summary of the status
         specification when scriptArgs, skip, and startAfter are specified.
         """
-        status = {
-            "user": "sally",
-            "firstStep": None,
-            "force": False,
-            "lastStep": None,
-            "nice": "None",
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": ["hey", "you"],
-            "skip": ["start-step"],
-            "sleep": 5.0,
-            "startAfter": [34, 56],
-            "steps": [
-                {
-                    "cwd": "00-start",
-                    "environ": {
-                        "SP_FORCE": "1",
-                        "SP_SKIP": "0",
-                    },
-                    "name": "start-step",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "00-start/start.sh",
-                    "skip": False,
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
+        status = _status(
+            [
+                _step(
+                    "start-step",
+                    script="00-start/start.sh",
+                    cwd="00-start",
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    skip=False,
+                ),
             ],
-        }
+            user="sally",
+            firstStep=None,
+            nice="None",
+            scriptArgs=["hey", "you"],
+            skip=["start-step"],
+            sleep=5.0,
+            startAfter=[34, 56],
+        )
 
-        subprocessMock.return_value = (
-            "JobID|JobName|State|Elapsed|Nodelist\n"
-            "34|name1|RUNNING|01:32:00|cpu-2\n"
-            "56|name2|COMPLETED|04:32:00|cpu-3\n"
+        self.subprocessMock.return_value = (
+            "34|name1|RUNNING|01:32:00|cpu-2\n" "56|name2|COMPLETED|04:32:00|cpu-3\n"
         )
 
         sps = SlurmPipelineStatus(status)
@@ -1026,74 +710,127 @@ Step 1: start-step
             sps.toStr(),
         )
 
+    def testToStrRepeated(self):
+        """
+        Calling toStr more than once must give the same result each time.
+        """
+        status = _status(
+            [
+                _step(
+                    "start-step",
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    skip=False,
+                ),
+            ],
+            firstStep=None,
+            scriptArgs=["hey", "you"],
+            startAfter=[34],
+        )
+
+        self.subprocessMock.return_value = "34|name1|RUNNING|01:32:00|cpu-2\n"
+
+        sps = SlurmPipelineStatus(status)
+        first = sps.toStr()
+        self.assertEqual(first, sps.toStr())
+        self.assertEqual(1, first.count("Scheduling arguments:"))
+
+    def testToStrCallsSAcctOnce(self):
+        """
+        The toStr method must get information about all jobs (from startAfter
+        and the tasks and task dependencies of all steps) from a single call
+        to sacct.
+        """
+        status = _status(
+            [
+                _step("start", environ={}, skip=False, tasks={"a": [0, 1], "b": [2]}),
+                _step(
+                    "end",
+                    dependencies=["start"],
+                    environ={},
+                    skip=False,
+                    taskDependencies={"a": [0, 1], "b": [2]},
+                    tasks={"a": [3, 4], "b": [5, 6]},
+                ),
+            ],
+            firstStep=None,
+            startAfter=[7, 8],
+        )
+
+        self.subprocessMock.return_value = SACCT_NINE_RUNNING
+
+        sps = SlurmPipelineStatus(status)
+        sps.toStr()
+        sps.toStr()
+        self.assertEqual(1, self.subprocessMock.call_count)
+        self.assertIn("0,1,2,3,4,5,6,7,8", self.subprocessMock.call_args.args[0])
+
+    def testRefresh(self):
+        """
+        Calling refresh must call sacct again and update the job information.
+        """
+        status = _status([_step("start", tasks={"a": [123]})])
+
+        self.subprocessMock.return_value = SACCT_ONE_RUNNING
+        sps = SlurmPipelineStatus(status)
+        self.assertEqual({123}, sps.unfinishedJobs())
+
+        self.subprocessMock.return_value = SACCT_ONE_COMPLETED
+        sps.refresh()
+        self.assertEqual(set(), sps.unfinishedJobs())
+        self.assertEqual({123}, sps.finishedJobs())
+        self.assertEqual(2, self.subprocessMock.call_count)
+
 
 class TestSlurmPipelineStatusCollection(TestCase):
     """
     Test the SlurmPipelineStatusCollection class.
     """
 
+    def setUp(self):
+        patcher = patch("subprocess.check_output")
+        self.subprocessMock = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def testNonIdenticalSteps(self):
         """
         If two specifications are passed that do not have the same list of steps,
         a ValueError error must be raised.
         """
-        status1 = {
-            "user": "sally",
-            "firstStep": None,
-            "force": False,
-            "lastStep": None,
-            "nice": "None",
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": ["hey", "you"],
-            "skip": [],
-            "sleep": 5.0,
-            "startAfter": [],
-            "steps": [
-                {
-                    "cwd": "00-start",
-                    "environ": {
-                        "SP_FORCE": "1",
-                        "SP_SKIP": "0",
-                    },
-                    "name": "step-1",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "00-start/start.sh",
-                    "skip": False,
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
+        status1 = _status(
+            [
+                _step(
+                    "step-1",
+                    script="00-start/start.sh",
+                    cwd="00-start",
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    skip=False,
+                ),
             ],
-        }
-
-        status2 = {
-            "user": "sally",
-            "firstStep": None,
-            "force": False,
-            "lastStep": None,
-            "nice": "None",
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": ["hey", "you"],
-            "skip": [],
-            "sleep": 5.0,
-            "startAfter": [],
-            "steps": [
-                {
-                    "cwd": "00-start",
-                    "environ": {
-                        "SP_FORCE": "1",
-                        "SP_SKIP": "0",
-                    },
-                    "name": "step-2",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "00-start/start.sh",
-                    "skip": False,
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
+            user="sally",
+            firstStep=None,
+            nice="None",
+            scriptArgs=["hey", "you"],
+            sleep=5.0,
+            startAfter=[],
+        )
+
+        status2 = _status(
+            [
+                _step(
+                    "step-2",
+                    script="00-start/start.sh",
+                    cwd="00-start",
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    skip=False,
+                ),
             ],
-        }
+            user="sally",
+            firstStep=None,
+            nice="None",
+            scriptArgs=["hey", "you"],
+            sleep=5.0,
+            startAfter=[],
+        )
 
         error = (
             r"^The list of steps found in the first specification \['step-1'\] does "
@@ -1107,34 +844,23 @@ class TestSlurmPipelineStatusCollection(TestCase):
         """
         The list of names must not have any duplicates.
         """
-        status = {
-            "user": "sally",
-            "firstStep": None,
-            "force": False,
-            "lastStep": None,
-            "nice": "None",
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": ["hey", "you"],
-            "skip": [],
-            "sleep": 5.0,
-            "startAfter": [],
-            "steps": [
-                {
-                    "cwd": "00-start",
-                    "environ": {
-                        "SP_FORCE": "1",
-                        "SP_SKIP": "0",
-                    },
-                    "name": "step-1",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "00-start/start.sh",
-                    "skip": False,
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {},
-                },
+        status = _status(
+            [
+                _step(
+                    "step-1",
+                    script="00-start/start.sh",
+                    cwd="00-start",
+                    environ={"SP_FORCE": "1", "SP_SKIP": "0"},
+                    skip=False,
+                ),
             ],
-        }
+            user="sally",
+            firstStep=None,
+            nice="None",
+            scriptArgs=["hey", "you"],
+            sleep=5.0,
+            startAfter=[],
+        )
 
         error = (
             r"^The list of specification names contains at least one "
@@ -1160,95 +886,61 @@ class TestSlurmPipelineStatusCollection(TestCase):
             ValueError, error, SlurmPipelineStatusCollection, (), ("a",)
         )
 
-    @patch("subprocess.check_output")
-    def testJobs(self, subprocessMock):
+    def testNoJobs(self):
+        """
+        If no specification emitted any jobs, the collection must have an empty
+        DataFrame and no non-empty steps, and sacct must not be called.
+        """
+        spsc = SlurmPipelineStatusCollection(
+            (
+                _status([_step("start"), _step("end")]),
+                _status([_step("start"), _step("end")]),
+            )
+        )
+
+        self.assertTrue(spsc.df.empty)
+        self.assertEqual([], spsc.nonEmptyStepNames)
+        self.assertEqual(["start", "end"], spsc.stepNames)
+        self.subprocessMock.assert_not_called()
+
+    def testJobs(self):
         """
         Test a realistic situation.
         """
 
-        status1 = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "xxx": [12, 34],
-                    },
-                },
-                {
-                    "name": "end",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "end.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "yyy": [56, 78, 90],
-                    },
-                },
-            ],
-        }
-
-        status2 = {
-            "force": False,
-            "lastStep": None,
-            "scheduledAt": 1481379658.5455897,
-            "scriptArgs": [],
-            "skip": [],
-            "startAfter": None,
-            "steps": [
-                {
-                    "name": "start",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "start.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "xxx": [13, 35],
-                    },
-                },
-                {
-                    "name": "end",
-                    "scheduledAt": 1481379659.1530972,
-                    "script": "end.sh",
-                    "stdout": "",
-                    "taskDependencies": {},
-                    "tasks": {
-                        "yyy": [57, 79, 91],
-                    },
-                },
-            ],
-        }
+        status1 = _status(
+            [
+                _step("start", tasks={"xxx": [12, 34]}),
+                _step("end", tasks={"yyy": [56, 78, 90]}),
+            ]
+        )
 
-        subprocessMock.side_effect = [
-            (
-                "JobID|JobName|State|Elapsed|Nodelist\n"
-                "12|name|RUNNING|04:32:00|cpu-3\n"
-                "34|name|COMPLETED|04:32:00|cpu-3\n"
-                "56|name|FAILED|04:32:00|cpu-4\n"
-                "78|name|COMPLETED|04:32:00|cpu-4\n"
-                "90|name|RUNNING|04:32:00|cpu-5\n"
-            ),
-            (
-                "JobID|JobName|State|Elapsed|Nodelist\n"
-                "13|name|RUNNING|00:00:10|cpu-3\n"
-                "35|name|COMPLETED|00:01:00|cpu-3\n"
-                "57|name|PENDING|00:00:00|cpu-4\n"
-                "79|name|COMPLETED|04:32:00|cpu-4\n"
-                "91|name|FAILED|04:32:00|cpu-5\n"
-            ),
-        ]
+        status2 = _status(
+            [
+                _step("start", tasks={"xxx": [13, 35]}),
+                _step("end", tasks={"yyy": [57, 79, 91]}),
+            ]
+        )
+
+        self.subprocessMock.return_value = (
+            "12|name|RUNNING|04:32:00|cpu-3\n"
+            "13|name|RUNNING|00:00:10|cpu-3\n"
+            "34|name|COMPLETED|04:32:00|cpu-3\n"
+            "35|name|COMPLETED|00:01:00|cpu-3\n"
+            "56|name|FAILED|04:32:00|cpu-4\n"
+            "57|name|PENDING|00:00:00|cpu-4\n"
+            "78|name|COMPLETED|04:32:00|cpu-4\n"
+            "79|name|COMPLETED|04:32:00|cpu-4\n"
+            "90|name|RUNNING|04:32:00|cpu-5\n"
+            "91|name|FAILED|04:32:00|cpu-5\n"
+        )
 
         spsc = SlurmPipelineStatusCollection((status1, status2))
 
+        # Information about the jobs of both specifications must have been
+        # fetched with one call to sacct.
+        self.subprocessMock.assert_called_once()
+
         # Cheap & nasty way to check that SlurmPipelineStatusCollection put
         # things into a DataFrame in the expected way.
         self.maxDiff = None
@@ -1266,3 +958,6 @@ class TestSlurmPipelineStatusCollection(TestCase):
 9  unnamed-1    end  yyy     91     FAILED  cpu-5  04:32:00    16320\
 """
         self.assertEqual(expected, str(spsc.df))
+
+        # The DataFrame is only made once, so changes to it are kept.
+        self.assertIs(spsc.df, spsc.df)
@@ -24,6 +24,18 @@ class TestSecondsToTime(TestCase):
             secondsToTime(1481379658.5455897, sacctCompatible=True),
         )
 
+    def testRepeatedCallsWithDifferentFormats(self):
+        """
+        Calling secondsToTime repeatedly with the same time must return the
+        expected value for each requested format.
+        """
+        seconds = 1481379658.5455897
+        self.assertEqual("2016-12-10 14:20:58", secondsToTime(seconds))
+        self.assertEqual(
+            "2016-12-10T14:20:58", secondsToTime(seconds, sacctCompatible=True)
+        )
+        self.assertEqual("2016-12-10 14:20:58", secondsToTime(seconds))
+
 
 class TestElapsedToSeconds(TestCase):
     """
@@ -59,3 +71,15 @@ class TestElapsedToSeconds(TestCase):
         One day must be 86400 seconds.
         """
         self.assertEqual(86400, elapsedToSeconds("1-00:00:00"))
+
+    def testDaysHoursMinutesSeconds(self):
+        """
+        Days, hours, minutes and seconds must all be counted.
+        """
+        self.assertEqual(1040523, elapsedToSeconds("12-01:02:03"))
+
+    def testThreeDigitHours(self):
+        """
+        An hours field with more than two digits must be converted correctly.
+        """
+        self.assertEqual(360000, elapsedToSeconds("100:00:00"))